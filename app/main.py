@@ -1,19 +1,34 @@
 
 from fastapi import FastAPI, HTTPException, Query, Depends
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, NamedTuple, Tuple
 from datetime import datetime, timezone
+from collections import Counter
+import base64
 import hashlib
-import json
+import numpy as np
+import orjson
 import re
 import os
 
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Text
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy import create_engine, bindparam, event, exists, func, insert, inspect, select, text, update, and_, or_, Column, String, Integer, Boolean, DateTime, Text, LargeBinary, Index, MetaData, Table
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker, declarative_base, load_only, Session
 from fastapi.middleware.cors import CORSMiddleware
 
+class UTCORJSONResponse(ORJSONResponse):
+    
+    # Naive datetimes come back from SQLite but are stored as UTC; orjson formats them natively.
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NAIVE_UTC)
+
+
 app = FastAPI(
     title="String Analyzer Service",
+    default_response_class=UTCORJSONResponse,
     
     
 )
@@ -28,17 +43,43 @@ app.add_middleware(
 
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./strings.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+if "sqlite" in DATABASE_URL:
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+else:
+    # Handlers are sync and run on FastAPI's threadpool (40 threads by default), so every
+    # worker thread can hold a connection without waiting on the pool.
+    engine = create_engine(DATABASE_URL, pool_size=20, max_overflow=40, pool_pre_ping=True)
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING RETURNING; others fall back to catching IntegrityError.
+_ON_CONFLICT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+on_conflict_insert = _ON_CONFLICT_INSERTS.get(engine.dialect.name)
+
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
 
 class StringEntry(Base):
     __tablename__ = "strings"
-    id = Column(String, primary_key=True, index=True)  # sha256
+    id = Column(String(64), primary_key=True)  # sha256 hex digest
     value = Column(Text, nullable=False, unique=True)
-    properties_json = Column(Text, nullable=False)
+    properties_json = Column(LargeBinary, nullable=False)
     created_at = Column(DateTime(timezone=True), nullable=False)
+    length = Column(Integer, nullable=False, index=True)
+    is_palindrome = Column(Boolean, nullable=False)  # served by ix_strings_is_palindrome_length
+    word_count = Column(Integer, nullable=False, index=True)
+    char_mask = Column(Integer, nullable=False)  # bit i set if chr(97 + i) occurs; unindexed, a B-tree can't serve &
+
+    __table_args__ = (
+        Index("ix_strings_is_palindrome_length", "is_palindrome", "length"),
+        Index("ix_strings_created_at_id", created_at.desc(), id.desc()),
+    )
 
 Base.metadata.create_all(bind=engine)
 
@@ -52,61 +93,123 @@ def get_db():
 
 
 
-def compute_properties(value: str) -> Dict[str, Any]:
+# hashlib.sha256 is OpenSSL's implementation whenever CPython is built against it,
+# which picks up the SHA-NI/ARMv8 SHA instructions on CPUs that have them.
+_sha256 = hashlib.sha256
+
+def hash_value(value: str) -> str:
     
-    v = value
-    length = len(v)
+    return _sha256(value.encode("utf-8")).hexdigest()
+
+_PALINDROME_CHUNK = 4096
+
+def _is_palindrome(value: str) -> bool:
+    
+    n = len(value)
+    if n <= _PALINDROME_CHUNK or not value.isascii():
+        # Lowercasing can change the length of non-ASCII text, so compare it whole.
+        lower = value.lower()
+        half = len(lower) // 2
+        return lower[:half] == lower[:len(lower) - half - 1:-1]
     
+    # Walk matching chunks in from both ends so a mismatch stops before the whole string is lowered.
+    half = n // 2
+    for i in range(0, half, _PALINDROME_CHUNK):
+        j = min(i + _PALINDROME_CHUNK, half)
+        if value[i:j].lower() != value[n - j:n - i].lower()[::-1]:
+            return False
+    return True
 
-    is_palindrome = v.lower() == v.lower()[::-1]
+_BINCOUNT_MIN_LENGTH = 1024
+
+def _character_frequency(value: str) -> Dict[str, int]:
     
-    unique_characters = len(set(v))
+    if len(value) < _BINCOUNT_MIN_LENGTH or not value.isascii():
+        return Counter(value)
     
+    counts = np.bincount(np.frombuffer(value.encode("ascii"), dtype=np.uint8), minlength=128)
+    # Match Counter's first-occurrence key order so the map serializes the same on both paths.
+    present = [chr(i) for i in np.flatnonzero(counts)]
+    present.sort(key=value.find)
+    return {ch: counts[ord(ch)].item() for ch in present}
+
+class _Analysis(NamedTuple):
+    length: int
+    is_palindrome: bool
+    unique_characters: int
+    word_count: int
+    character_frequency: Dict[str, int]
+    char_mask: int
 
-    word_count = 0 if v.strip() == "" else len(v.split())
+def analyze(value: str) -> _Analysis:
+    
+    v = value
+    length = len(v)
+    
+    is_palindrome = _is_palindrome(v)
     
-    sha = hashlib.sha256(v.encode("utf-8")).hexdigest()
+    freq = _character_frequency(v)
+    unique_characters = len(freq)
     
+    word_count = len(v.split())
     
-    freq = {}
-    for ch in v:
-        freq[ch] = freq.get(ch, 0) + 1
+    char_mask = 0
+    for ch in freq:
+        if "a" <= ch <= "z":
+            char_mask |= 1 << (ord(ch) - 97)
+    
+    return _Analysis(length, is_palindrome, unique_characters, word_count, dict(freq), char_mask)
+
+def properties_from_analysis(a: _Analysis, sha: str) -> Dict[str, Any]:
     
     return {
-        "length": length,
-        "is_palindrome": is_palindrome,
-        "unique_characters": unique_characters,
-        "word_count": word_count,
+        "length": a.length,
+        "is_palindrome": a.is_palindrome,
+        "unique_characters": a.unique_characters,
+        "word_count": a.word_count,
         "sha256_hash": sha,
-        "character_frequency_map": freq,
+        "character_frequency_map": a.character_frequency,
     }
 
+# One alternation so the query is scanned once; the outer group names tell the matches apart.
+# Plain keywords are checked with substring tests instead, since a single scan never
+# matches them where they overlap another pattern (e.g. "letter palindrome").
+_NL_RE = re.compile(
+    r"(?P<single_word>(?:single|one) word)"
+    r"|(?P<longer_than>longer than (?P<length>\d+))"
+    # The letter is captured in a lookahead so it can still start "one word".
+    r"|(?P<contains>contain(?:ing|s)? (?:the )?letter (?=(?P<letter>[a-z])))"
+)
+
 def parse_nl_query(q: str) -> Dict[str, Any]:
     
     q_lower = q.lower()
-    parsed: Dict[str, Any] = {}
+    single_word = False
+    min_length: Optional[int] = None
+    letter: Optional[str] = None
+    
+    for m in _NL_RE.finditer(q_lower):
+        kind = m.lastgroup
+        if kind == "single_word":
+            single_word = True
+        elif kind == "longer_than":
+            if min_length is None:
+                min_length = int(m.group("length")) + 1
+        elif kind == "contains":
+            if letter is None:
+                letter = m.group("letter")
     
-  
-    if re.search(r"(single|one) word", q_lower):
+    parsed: Dict[str, Any] = {}
+    if single_word:
         parsed["word_count"] = 1
-    
-   
-    m = re.search(r"longer than (\d+)", q_lower)
-    if m:
-        parsed["min_length"] = int(m.group(1)) + 1 
-    
-   
+    if min_length is not None:
+        parsed["min_length"] = min_length
     if "palindrom" in q_lower:
         parsed["is_palindrome"] = True
-    
-    
-    m = re.search(r"contain(?:ing|s)? (?:the )?letter ([a-z])", q_lower)
-    if m:
-        parsed["contains_character"] = m.group(1)
-    
-   
-    if re.search(r"first vowel", q_lower):
+    if "first vowel" in q_lower:
         parsed["contains_character"] = "a"
+    elif letter is not None:
+        parsed["contains_character"] = letter
     
     
     if "min_length" in parsed and "max_length" in parsed:
@@ -118,8 +221,80 @@ def parse_nl_query(q: str) -> Dict[str, Any]:
     
     return parsed
 
+_INDEXED_PROPERTY_COLUMNS = ("length", "is_palindrome", "word_count", "char_mask")
+# Indexes earlier versions created that no query uses; they only cost a write per insert.
+_OBSOLETE_INDEXES = ("ix_strings_id", "ix_strings_is_palindrome", "ix_strings_char_mask")
+
+def migrate_legacy_schema() -> None:
+    
+    # create_all never alters an existing table, so bring tables from before the indexed
+    # columns up to date here. Every step checks first, so once migrated this costs one
+    # indexed lookup for unfilled rows plus catalog reads.
+    inspector = inspect(engine)
+    columns = {c["name"]: c for c in inspector.get_columns(StringEntry.__tablename__)}
+    table = StringEntry.__table__
+    
+    with engine.begin() as conn:
+        legacy = False
+        for name in _INDEXED_PROPERTY_COLUMNS:
+            if name not in columns:
+                legacy = True
+                type_sql = table.c[name].type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {type_sql}"))
+        
+        # properties_json used to be TEXT; the model now reads it as bytes. SQLite keeps the
+        # declared TEXT type, so convert its rows only in the same transaction that adds the columns.
+        if engine.dialect.name == "sqlite" and legacy:
+            conn.execute(text(
+                f"UPDATE {table.name} SET properties_json = CAST(properties_json AS BLOB) "
+                "WHERE typeof(properties_json) = 'text'"
+            ))
+        elif engine.dialect.name == "postgresql" and not isinstance(columns["properties_json"]["type"], LargeBinary):
+            conn.execute(text(
+                f"ALTER TABLE {table.name} ALTER COLUMN properties_json TYPE BYTEA "
+                "USING convert_to(properties_json, 'UTF8')"
+            ))
+        
+        pending = conn.execute(
+            select(table.c.id, table.c.value).where(table.c.length.is_(None))
+        ).all()
+        if pending:
+            updates = []
+            for row_id, value in pending:
+                a = analyze(value)
+                updates.append({
+                    "row_id": row_id,
+                    "length": a.length,
+                    "is_palindrome": a.is_palindrome,
+                    "word_count": a.word_count,
+                    "char_mask": a.char_mask,
+                })
+            conn.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(
+                    length=bindparam("length"),
+                    is_palindrome=bindparam("is_palindrome"),
+                    word_count=bindparam("word_count"),
+                    char_mask=bindparam("char_mask"),
+                ),
+                updates,
+            )
+    
+    existing = Table(table.name, MetaData(), autoload_with=engine)
+    for index in existing.indexes:
+        if index.name in _OBSOLETE_INDEXES:
+            index.drop(bind=engine)
+    
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+migrate_legacy_schema()
+
 
 class CreateRequest(BaseModel):
+    model_config = ConfigDict(strict=True)
+    
     value: str = Field(..., description="String to analyze")
 
 class PropertiesModel(BaseModel):
@@ -139,45 +314,86 @@ class StringResponse(BaseModel):
 
 
 
+def encode_cursor(row: StringEntry) -> str:
+    
+    raw = orjson.dumps([row.created_at.isoformat(), row.id])
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    
+    try:
+        created_at, row_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        parsed_created_at = datetime.fromisoformat(created_at)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(row_id, str):
+        raise ValueError("Invalid cursor")
+    return parsed_created_at, row_id
+
+
 def row_to_response(row: StringEntry) -> Dict[str, Any]:
     
-    props = json.loads(row.properties_json)
     return {
         "id": row.id,
         "value": row.value,
-        "properties": props,
-        "created_at": row.created_at.replace(tzinfo=timezone.utc).isoformat(),
+        # Stored properties are already JSON; embed the bytes without decoding them.
+        "properties": orjson.Fragment(row.properties_json),
+        "created_at": row.created_at,
     }
 
 
 @app.post("/strings", status_code=201)
 def create_string(req: CreateRequest, db: Session = Depends(get_db)):
     
-   
-    if not isinstance(req.value, str):
-        raise HTTPException(status_code=422, detail="Field 'value' must be a string")
- 
-    props = compute_properties(req.value)
-    sha = props["sha256_hash"]
+    sha = hash_value(req.value)
     
    
-    existing = db.query(StringEntry).filter(StringEntry.id == sha).first()
-    if existing:
+    if db.query(exists().where(StringEntry.id == sha)).scalar():
         raise HTTPException(status_code=409, detail="String already exists in the system")
     
+    a = analyze(req.value)
+    props = properties_from_analysis(a, sha)
     
     now = datetime.now(timezone.utc)
-    row = StringEntry(
+    values = dict(
         id=sha,
         value=req.value,
-        properties_json=json.dumps(props),
-        created_at=now
+        properties_json=orjson.dumps(props),
+        created_at=now,
+        length=a.length,
+        is_palindrome=a.is_palindrome,
+        word_count=a.word_count,
+        char_mask=a.char_mask,
     )
-    db.add(row)
+    
+    # The probe above skips the analysis for known duplicates; the insert still has to
+    # handle a concurrent create of the same value that lands in between.
+    if on_conflict_insert is not None:
+        stmt = (
+            on_conflict_insert(StringEntry)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(StringEntry.id)
+        )
+        inserted = db.execute(stmt).first() is not None
+    else:
+        try:
+            db.execute(insert(StringEntry).values(**values))
+            inserted = True
+        except IntegrityError:
+            inserted = False
+    
+    if not inserted:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="String already exists in the system")
     db.commit()
-    db.refresh(row)
     
-    return row_to_response(row)
+    return UTCORJSONResponse({
+        "id": sha,
+        "value": req.value,
+        "properties": props,
+        "created_at": now,
+    }, status_code=201)
 
 
 @app.get("/strings/{string_value}")
@@ -192,47 +408,67 @@ def get_string(string_value: str, db: Session = Depends(get_db)):
     if not row:
         raise HTTPException(status_code=404, detail="String does not exist in the system")
     
-    return row_to_response(row)
+    return UTCORJSONResponse(row_to_response(row))
 
 
-@app.get("/strings")
-def list_strings(
-    is_palindrome: Optional[bool] = Query(None, description="Filter by palindrome status"),
-    min_length: Optional[int] = Query(None, ge=0, description="Minimum string length"),
-    max_length: Optional[int] = Query(None, ge=0, description="Maximum string length"),
-    word_count: Optional[int] = Query(None, ge=0, description="Exact word count"),
-    contains_character: Optional[str] = Query(None, min_length=1, max_length=1, description="Character that must be present"),
-    db: Session = Depends(get_db)
-):
+def query_strings(
+    db: Session,
+    is_palindrome: Optional[bool] = None,
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    word_count: Optional[int] = None,
+    contains_character: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
     
     if min_length is not None and max_length is not None:
         if min_length > max_length:
             raise HTTPException(status_code=400, detail="min_length cannot be greater than max_length")
     
-   
-    rows = db.query(StringEntry).all()
-    results = []
+    if cursor is not None:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
-    for r in rows:
-        props = json.loads(r.properties_json)
-        ok = True
-        
-       
-        if is_palindrome is not None and props.get("is_palindrome") != is_palindrome:
-            ok = False
-        if min_length is not None and props.get("length") < min_length:
-            ok = False
-        if max_length is not None and props.get("length") > max_length:
-            ok = False
-        if word_count is not None and props.get("word_count") != word_count:
-            ok = False
-        if contains_character is not None:
-            char_freq = props.get("character_frequency_map", {})
-            if char_freq.get(contains_character, 0) == 0:
-                ok = False
-        
-        if ok:
-            results.append(row_to_response(r))
+   
+    stmt = select(StringEntry).options(
+        load_only(StringEntry.id, StringEntry.value, StringEntry.properties_json, StringEntry.created_at)
+    )
+    if is_palindrome is not None:
+        stmt = stmt.where(StringEntry.is_palindrome == is_palindrome)
+    if min_length is not None:
+        stmt = stmt.where(StringEntry.length >= min_length)
+    if max_length is not None:
+        stmt = stmt.where(StringEntry.length <= max_length)
+    if word_count is not None:
+        stmt = stmt.where(StringEntry.word_count == word_count)
+    if contains_character is not None and "a" <= contains_character <= "z":
+        bit = 1 << (ord(contains_character) - 97)
+        stmt = stmt.where(StringEntry.char_mask.op("&")(bit) != 0)
+    elif contains_character is not None and engine.dialect.name == "sqlite":
+        # SQLite's LIKE ignores ASCII case, so use instr() for the case-sensitive match.
+        stmt = stmt.where(func.instr(StringEntry.value, contains_character) > 0)
+    elif contains_character is not None:
+        stmt = stmt.where(StringEntry.value.contains(contains_character, autoescape=True))
+    
+    if cursor is not None:
+        # Expanded instead of a row-value comparison, which not every backend supports.
+        stmt = stmt.where(or_(
+            StringEntry.created_at < cursor_created_at,
+            and_(StringEntry.created_at == cursor_created_at, StringEntry.id < cursor_id),
+        ))
+    stmt = stmt.order_by(StringEntry.created_at.desc(), StringEntry.id.desc()).limit(limit + 1)
+    
+    rows = db.execute(stmt).scalars().all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    
+    results = [row_to_response(r) for r in rows]
     
     
     filters_applied = {}
@@ -250,12 +486,40 @@ def list_strings(
     return {
         "data": results,
         "count": len(results),
+        "next_cursor": next_cursor,
         "filters_applied": filters_applied
     }
 
+
+@app.get("/strings")
+def list_strings(
+    is_palindrome: Optional[bool] = Query(None, description="Filter by palindrome status"),
+    min_length: Optional[int] = Query(None, ge=0, description="Minimum string length"),
+    max_length: Optional[int] = Query(None, ge=0, description="Maximum string length"),
+    word_count: Optional[int] = Query(None, ge=0, description="Exact word count"),
+    contains_character: Optional[str] = Query(None, min_length=1, max_length=1, description="Character that must be present"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db)
+):
+    
+    # Returning the response directly skips FastAPI's jsonable_encoder pass over every row.
+    return UTCORJSONResponse(query_strings(
+        db,
+        is_palindrome=is_palindrome,
+        min_length=min_length,
+        max_length=max_length,
+        word_count=word_count,
+        contains_character=contains_character,
+        limit=limit,
+        cursor=cursor,
+    ))
+
 @app.get("/strings/filter-by-natural-language")
 def nl_filter(
     query: str = Query(..., description="Natural language query"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
     
@@ -268,13 +532,15 @@ def nl_filter(
         raise HTTPException(status_code=400, detail=str(e))
     
   
-    result = list_strings(
+    result = query_strings(
+        db,
         is_palindrome=parsed.get("is_palindrome"),
         min_length=parsed.get("min_length"),
         max_length=parsed.get("max_length"),
         word_count=parsed.get("word_count"),
         contains_character=parsed.get("contains_character"),
-        db=db
+        limit=limit,
+        cursor=cursor,
     )
     
     
@@ -283,7 +549,7 @@ def nl_filter(
         "parsed_filters": parsed
     }
     
-    return result
+    return UTCORJSONResponse(result)
 
 
 @app.delete("/strings/{string_value}", status_code=204)